@@ -15,6 +15,17 @@ class Settings(BaseSettings):
     max_session_duration: int = 900  # 15 minutes in seconds
     prompt_interval: int = 15  # minimum seconds between prompts
     context_window_duration: int = 60  # seconds of transcript to keep
+    prompt_min_new_words: int = 8  # new (non-filler) words needed to regenerate
+
+    # OpenAI rate limits (shared by every session in this process)
+    openai_rpm_limit: int = 500  # requests per minute
+    openai_tpm_limit: int = 200000  # tokens per minute
+    llm_max_concurrency: int = 4  # simultaneous in-flight LLM calls
+    llm_max_queue_wait: float = 20.0  # seconds before a queued prompt is dropped
+
+    # Compute offload (audio transcoding runs on low-priority worker processes)
+    compute_workers: int = 2
+    offload_compute: bool = True  # False runs it inline on the event loop
 
     # CORS settings
     cors_origins: list = ["*"]
@@ -1,14 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.websocket.handler import WebSocketHandler
+from app.services.loop_monitor import LoopLagMonitor
+from app.websocket.handler import WebSocketHandler, compute_pool, llm_scheduler, session_manager
 
 settings = get_settings()
+loop_monitor = LoopLagMonitor()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background monitoring and workers; release workers on shutdown."""
+    loop_monitor.start()
+    await compute_pool.start()
+    yield
+    await loop_monitor.stop()
+    compute_pool.shutdown()
+
 
 app = FastAPI(
     title="PromptCast API",
     description="AI-powered real-time video prompt assistant",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -37,6 +52,17 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/stats")
+async def stats():
+    """Runtime statistics for monitoring."""
+    return {
+        "llmScheduler": llm_scheduler.get_stats(),
+        "sessions": session_manager.get_stats(),
+        "eventLoopLag": loop_monitor.get_stats(),
+        "offloadCompute": compute_pool.enabled,
+    }
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for recording sessions."""
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+
+
+SUPPORTED_ENCODINGS = {
+    "float32": np.dtype("<f4"),
+    "int16": np.dtype("<i2"),
+}
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Describes raw PCM audio: sample encoding, rate and interleaved channels."""
+
+    encoding: str = "int16"
+    sample_rate: int = 16000
+    channels: int = 1
+
+    def __post_init__(self):
+        if self.encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported audio encoding: {self.encoding}")
+        if not 8000 <= self.sample_rate <= 192000:
+            raise ValueError(f"Unsupported sample rate: {self.sample_rate}")
+        if not 1 <= self.channels <= 8:
+            raise ValueError(f"Unsupported channel count: {self.channels}")
+
+    @classmethod
+    def from_message(cls, data: dict) -> "AudioFormat":
+        """Build a format from the client's `audio_format` message payload."""
+        if not isinstance(data, dict):
+            raise ValueError("Audio format must be an object")
+        try:
+            return cls(
+                encoding=str(data.get("encoding", "int16")),
+                sample_rate=int(data.get("sampleRate", 16000)),
+                channels=int(data.get("channels", 1)),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid audio format: {e}") from e
+
+    @property
+    def dtype(self) -> np.dtype:
+        return SUPPORTED_ENCODINGS[self.encoding]
+
+    @property
+    def frame_size(self) -> int:
+        """Bytes per frame (one sample for every channel)."""
+        return self.dtype.itemsize * self.channels
+
+
+# What Deepgram is told to expect - everything is converted to this
+UPSTREAM_FORMAT = AudioFormat(encoding="int16", sample_rate=16000, channels=1)
+
+
+class AudioTranscoder:
+    """
+    Converts a stream of client audio chunks to the upstream format.
+
+    Every stage works on whole chunks with NumPy: decode, downmix to mono,
+    anti-alias low-pass (when downsampling), linear-interpolation resample
+    and int16 encode. Filter history, resampler phase, the last input sample
+    and any partial frame are carried between chunks so the output is
+    continuous no matter how the client splits the stream.
+    """
+
+    def __init__(self, source: AudioFormat, target: AudioFormat = UPSTREAM_FORMAT):
+        if target.channels != 1 or target.encoding != "int16":
+            raise ValueError("Only mono int16 output is supported")
+
+        self.source = source
+        self.target = target
+        self._step = source.sample_rate / target.sample_rate
+        self._position = 0.0  # Next output sample, relative to the buffer start
+        self._last_sample: Optional[np.ndarray] = None  # Carried for interpolation
+        self._remainder = b""  # Partial frame left over from the previous chunk
+
+        # Downsampling needs a low-pass first, or content above the target
+        # Nyquist frequency folds back into the speech band
+        self._lowpass: Optional[np.ndarray] = None
+        if source.sample_rate > target.sample_rate:
+            self._lowpass = self._design_lowpass(source.sample_rate, target.sample_rate)
+            self._history = np.zeros(self._lowpass.size - 1, dtype=np.float32)
+
+    @property
+    def is_passthrough(self) -> bool:
+        return self.source == self.target
+
+    def convert(self, chunk: bytes) -> bytes:
+        """Convert one chunk of source audio; may return b"" for tiny chunks."""
+        if self.is_passthrough:
+            return chunk
+
+        samples = self._decode(chunk)
+        if samples.size == 0:
+            return b""
+
+        if self._lowpass is not None:
+            samples = self._filter(samples)
+
+        if self.source.sample_rate != self.target.sample_rate:
+            samples = self._resample(samples)
+
+        return self._encode(samples)
+
+    def _decode(self, chunk: bytes) -> np.ndarray:
+        """Decode whole frames to mono float32 in [-1, 1]."""
+        data = self._remainder + chunk if self._remainder else chunk
+        usable = len(data) - len(data) % self.source.frame_size
+        self._remainder = data[usable:]
+
+        raw = np.frombuffer(data, dtype=self.source.dtype, count=usable // self.source.dtype.itemsize)
+        if self.source.encoding == "int16":
+            samples = raw.astype(np.float32)
+            samples *= 1.0 / 32768.0
+        else:
+            samples = raw.astype(np.float32, copy=False)
+
+        if self.source.channels > 1:
+            samples = samples.reshape(-1, self.source.channels).mean(axis=1, dtype=np.float32)
+
+        return samples
+
+    @staticmethod
+    def _design_lowpass(source_rate: int, target_rate: int) -> np.ndarray:
+        """
+        Blackman-windowed sinc low-pass cut off at the target Nyquist frequency.
+        The transition band is 20% of the target rate (3.2 kHz for 16 kHz), so
+        everything that would alias below 6.4 kHz is attenuated by ~70 dB.
+        """
+        transition = 0.2 * target_rate
+        taps = int(np.ceil(5.5 * source_rate / transition)) | 1
+        cutoff = 0.5 * target_rate / source_rate  # Cycles per source sample
+        n = np.arange(taps) - (taps - 1) / 2
+        kernel = np.sinc(2 * cutoff * n) * np.blackman(taps)
+        return (kernel / kernel.sum()).astype(np.float32)
+
+    def _filter(self, samples: np.ndarray) -> np.ndarray:
+        """Apply the low-pass, carrying the tail of this chunk into the next."""
+        padded = np.concatenate((self._history, samples))
+        self._history = padded[-(self._lowpass.size - 1):].copy()
+        return np.convolve(padded, self._lowpass, mode="valid")
+
+    def _resample(self, samples: np.ndarray) -> np.ndarray:
+        """Linear-interpolation resample that stays phase-continuous across chunks."""
+        if self._last_sample is not None:
+            samples = np.concatenate((self._last_sample, samples))
+
+        last_index = samples.size - 1
+        # Only emit output positions strictly inside this buffer; the rest
+        # are produced once the next chunk supplies the right-hand neighbour
+        count = max(0, int(np.ceil((last_index - self._position) / self._step - 1e-9)))
+        positions = self._position + self._step * np.arange(count, dtype=np.float64)
+
+        self._position += count * self._step - last_index
+        self._last_sample = samples[-1:].copy()
+
+        return np.interp(positions, np.arange(samples.size, dtype=np.float64), samples).astype(np.float32)
+
+    @staticmethod
+    def _encode(samples: np.ndarray) -> bytes:
+        """Encode float samples as little-endian int16 PCM."""
+        scaled = np.clip(samples, -1.0, 1.0)
+        scaled *= 32767.0
+        return scaled.astype("<i2").tobytes()
+
+
+def transcode(transcoder: AudioTranscoder, chunk: bytes) -> tuple[AudioTranscoder, bytes]:
+    """
+    Convert one chunk and hand back the updated transcoder. Lets a worker
+    process do the conversion: the stream state travels with the call.
+    """
+    data = transcoder.convert(chunk)
+    return transcoder, data
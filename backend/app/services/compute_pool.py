@@ -0,0 +1,76 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+
+# Workers run at lower CPU priority so the OS always prefers the event loop
+WORKER_NICENESS = 10
+
+
+def _lower_priority():
+    if hasattr(os, "nice"):
+        os.nice(WORKER_NICENESS)
+
+
+class ComputePool:
+    """
+    Bounded pool of low-priority worker processes for CPU-heavy per-session
+    work (audio transcoding).
+
+    Worker processes don't contend for the event loop's GIL, and their lower
+    priority means the OS runs them in the loop's idle time instead of
+    preempting it - even on a single core. Functions must be module-level and
+    take picklable arguments; stateful work passes its state in and returns
+    it. Work submitted under the same lane key runs one at a time, in
+    submission order.
+    """
+
+    def __init__(self, max_workers: int = 2, enabled: bool = True):
+        self.enabled = enabled
+        self.max_workers = max_workers
+        self._executor = self._create_executor() if enabled else None
+        self._lanes: dict[str, asyncio.Lock] = {}
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_lower_priority,
+        )
+
+    async def start(self):
+        """Start every worker up front so spawn cost isn't paid mid-session."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, os.getpid) for _ in range(self.max_workers)
+        ))
+
+    async def run(self, lane: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn` on a worker after earlier work in the same lane finishes."""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+
+        lock = self._lanes.setdefault(lane, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+            except BrokenProcessPool:
+                # A worker died - replace the pool and do this item inline
+                print("Compute pool broken, restarting workers")
+                self._executor = self._create_executor()
+                return fn(*args, **kwargs)
+
+    def release(self, lane: str):
+        """Forget a lane once its session has ended."""
+        self._lanes.pop(lane, None)
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -4,6 +4,7 @@ from typing import Callable, Optional
 from websockets.asyncio.client import connect
 from websockets.exceptions import ConnectionClosed
 from app.config import get_settings
+from app.services.audio_transcoder import UPSTREAM_FORMAT
 
 settings = get_settings()
 
@@ -24,12 +25,13 @@ class DeepgramService:
     async def connect(self):
         """Connect to Deepgram's WebSocket API."""
         url = "wss://api.deepgram.com/v1/listen"
+        # Client audio is transcoded to UPSTREAM_FORMAT before it is sent here
         params = (
             "?model=nova-2"  # Best accuracy model
             "&language=en-IN"  # Indian English for better recognition
             "&encoding=linear16"
-            "&sample_rate=16000"
-            "&channels=1"
+            f"&sample_rate={UPSTREAM_FORMAT.sample_rate}"
+            f"&channels={UPSTREAM_FORMAT.channels}"
             "&punctuate=true"
             "&interim_results=true"
             "&endpointing=300"
@@ -0,0 +1,267 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Optional
+
+
+# How often queued requests are re-checked for usefulness while they wait
+RECHECK_INTERVAL = 1.0
+
+# Hold-off after a 429 when the response didn't say how long to wait
+DEFAULT_RATE_LIMIT_BACKOFF = 10.0
+
+
+class Priority(IntEnum):
+    """LLM request priority - lower values are dispatched first."""
+
+    PAUSE = 0  # Speaker is pausing right now and has nothing to show
+    CLOSING = 1  # Session is about to end
+    OPENER = 2  # First prompt of a session
+    FOLLOW_UP = 3  # Speculative mid-session prompt
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously up to its capacity."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        missing = min(amount, self.capacity) - self._tokens
+        return max(0.0, missing / self.refill_per_second)
+
+    def consume(self, amount: float):
+        self._refill()
+        self._tokens -= min(amount, self.capacity)
+
+    def drain(self):
+        """Empty the bucket so it has to refill from zero."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+@dataclass
+class _QueuedRequest:
+    get_priority: Callable[[], Priority]
+    is_useful: Callable[[], bool]
+    tokens: int
+    deadline: float
+    seq: int
+    priority: Priority  # Refreshed on every dispatch pass
+    enqueued: float = field(default_factory=time.monotonic)
+    granted: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class _WaitStats:
+    """Queue wait times for one priority level."""
+
+    def __init__(self):
+        self.dispatched = 0
+        self.dropped = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent: deque = deque(maxlen=500)
+
+    def record(self, wait: float):
+        self.dispatched += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent.append(wait)
+
+    def as_dict(self) -> dict:
+        recent = sorted(self.recent)
+        p95 = recent[int(0.95 * (len(recent) - 1))] if recent else 0.0
+        return {
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "avgWaitMs": round(1000 * self.total_wait / self.dispatched, 1) if self.dispatched else 0.0,
+            "p95WaitMs": round(1000 * p95, 1),
+            "maxWaitMs": round(1000 * self.max_wait, 1),
+        }
+
+
+class LLMScheduler:
+    """
+    Process-wide gate in front of LLM calls.
+
+    Requests wait in a priority queue and are dispatched only when both the
+    requests-per-minute and tokens-per-minute buckets allow it. Priority is
+    re-evaluated at dispatch time, so a session that starts pausing jumps
+    ahead of speculative work. Requests that are no longer useful, or have
+    waited past their deadline, are dropped without calling the LLM.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int = 4,
+        max_queue_wait: float = 20.0,
+    ):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.max_concurrency = max_concurrency
+        self.max_queue_wait = max_queue_wait
+
+        self._queue: list[_QueuedRequest] = []
+        self._active = 0
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._hold_until = 0.0  # No dispatching before this (after a 429)
+        self._rate_limited = 0
+        self._stats = {priority: _WaitStats() for priority in Priority}
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        get_priority: Callable[[], Priority],
+        is_useful: Callable[[], bool] = lambda: True,
+        estimated_tokens: int = 0,
+    ) -> Optional[Any]:
+        """
+        Queue an LLM call and run it once the scheduler grants a slot.
+
+        Returns the call's result, or None if the request was dropped.
+        """
+        self._ensure_dispatcher()
+
+        request = _QueuedRequest(
+            get_priority=get_priority,
+            is_useful=is_useful,
+            tokens=estimated_tokens,
+            deadline=time.monotonic() + self.max_queue_wait,
+            seq=next(self._seq),
+            priority=get_priority(),
+        )
+        self._queue.append(request)
+        self._wakeup.set()
+
+        try:
+            granted = await request.granted
+        except asyncio.CancelledError:
+            if request in self._queue:
+                self._queue.remove(request)
+            elif request.granted.done() and not request.granted.cancelled() and request.granted.result():
+                self._release()
+            raise
+
+        if not granted:
+            return None
+
+        try:
+            return await call()
+        finally:
+            self._release()
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        Report that upstream rate-limited a call. Dispatching stops for
+        `retry_after` seconds and the request bucket restarts from empty.
+        """
+        backoff = retry_after if retry_after and retry_after > 0 else DEFAULT_RATE_LIMIT_BACKOFF
+        self._hold_until = max(self._hold_until, time.monotonic() + backoff)
+        self._requests.drain()
+        self._rate_limited += 1
+        if self._wakeup:
+            self._wakeup.set()
+
+    def get_stats(self) -> dict:
+        """Queue depth and wait-time statistics per priority."""
+        return {
+            "queued": len(self._queue),
+            "active": self._active,
+            "rateLimited": self._rate_limited,
+            "priorities": {
+                priority.name.lower(): stats.as_dict()
+                for priority, stats in self._stats.items()
+            },
+        }
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    def _release(self):
+        self._active -= 1
+        self._wakeup.set()
+
+    async def _dispatch_loop(self):
+        while True:
+            delay = self._dispatch_ready()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch_ready(self) -> Optional[float]:
+        """
+        Grant every request that can run now.
+
+        Returns seconds until the next request could be granted, or None if
+        the dispatcher should just wait for the next submit/release.
+        """
+        now = time.monotonic()
+
+        # Drop requests nobody needs any more before spending quota on them
+        for request in list(self._queue):
+            if request.granted.done():
+                self._queue.remove(request)
+            elif now >= request.deadline or not self._refresh(request):
+                self._queue.remove(request)
+                self._stats[request.priority].dropped += 1
+                request.granted.set_result(False)
+
+        next_check = min((r.deadline for r in self._queue), default=now + RECHECK_INTERVAL)
+        next_check = min(next_check, now + RECHECK_INTERVAL)
+
+        if self._queue and now < self._hold_until:
+            return min(self._hold_until, next_check) - now
+
+        while self._queue and self._active < self.max_concurrency:
+            request = min(self._queue, key=lambda r: (r.priority, r.seq))
+
+            delay = max(self._requests.time_until(1), self._tokens.time_until(request.tokens))
+            if delay > 0:
+                # Wake early to re-check deadlines and usefulness meanwhile
+                return min(delay, max(0.0, next_check - now))
+
+            self._requests.consume(1)
+            self._tokens.consume(request.tokens)
+            self._queue.remove(request)
+            self._active += 1
+            self._stats[request.priority].record(now - request.enqueued)
+            request.granted.set_result(True)
+
+        if self._queue:
+            return max(0.0, next_check - now)
+        return None
+
+    @staticmethod
+    def _refresh(request: _QueuedRequest) -> bool:
+        """
+        Re-evaluate a request's callbacks. A callback that raises must not
+        kill the shared dispatcher, so the request is treated as not useful.
+        """
+        try:
+            # Priority first, so a drop is counted under the request's own level
+            request.priority = request.get_priority()
+            return bool(request.is_useful())
+        except Exception as e:
+            print(f"LLM scheduler callback failed, dropping request: {e}")
+            return False
@@ -0,0 +1,57 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a sleeping task wakes up.
+
+    Lag grows when something blocks the loop, so its percentiles show how
+    much CPU work in one session delays everything else in the process.
+    """
+
+    def __init__(self, interval: float = 0.1, window: int = 3000):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=window)  # ~5 minutes at 100ms
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self):
+        self._samples.clear()
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, time.perf_counter() - expected))
+
+    def get_stats(self) -> dict:
+        """Lag percentiles in milliseconds over the recent window."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "p50Ms": 0.0, "p95Ms": 0.0, "p99Ms": 0.0, "maxMs": 0.0}
+
+        def percentile(p: float) -> float:
+            return round(1000 * samples[int(p * (len(samples) - 1))], 2)
+
+        return {
+            "samples": len(samples),
+            "p50Ms": percentile(0.50),
+            "p95Ms": percentile(0.95),
+            "p99Ms": percentile(0.99),
+            "maxMs": round(1000 * samples[-1], 2),
+        }
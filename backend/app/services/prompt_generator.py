@@ -1,6 +1,5 @@
-import asyncio
-from typing import Optional
-from openai import AsyncOpenAI
+from typing import Callable, Optional
+from openai import AsyncOpenAI, RateLimitError
 from app.config import get_settings
 
 settings = get_settings()
@@ -42,15 +41,79 @@ NEVER:
 
 Return ONLY your response (question, reaction, or encouragement), nothing else."""
 
+MAX_RESPONSE_TOKENS = 80
+
+
+def build_user_message(
+    transcript: str,
+    duration_seconds: int,
+    is_closing: bool,
+    full_transcript: str,
+    previous_questions: list[str],
+) -> tuple[str, str]:
+    """
+    Build the user message for a prompt request. Takes plain, picklable
+    arguments so it can run on any worker.
+
+    Returns:
+        A (user_message, prompt_type) tuple
+    """
+    # Focus on the LAST part of transcript (most recent speech)
+    # Split by sentences and take the last few
+    sentences = transcript.replace('?', '?.').replace('!', '!.').replace('.', '.|').split('|')
+    sentences = [s.strip() for s in sentences if s.strip()]
+
+    # Take last 3-4 sentences as the focus
+    recent_sentences = sentences[-4:] if len(sentences) > 4 else sentences
+    recent_transcript = ' '.join(recent_sentences)
+
+    # Build context about previous questions - STRONGLY enforce no repetition
+    prev_q_context = ""
+    if previous_questions:
+        prev_q_context = f"\n\nQUESTIONS ALREADY ASKED (DO NOT ask similar ones - pick a DIFFERENT topic!):\n" + "\n".join(f"- {q}" for q in previous_questions[-5:])
+
+    if is_closing:
+        context = "Session ending soon. Ask a good closing/reflective question."
+        prompt_type = "closing"
+    elif duration_seconds < 30:
+        context = "Just started. Ask about something interesting they mentioned."
+        prompt_type = "opener"
+    else:
+        context = "Mid-conversation. Ask a follow-up about their MOST RECENT point. You can make connections to earlier topics."
+        prompt_type = "follow_up"
+
+    # Build the full context section
+    full_context_section = ""
+    if full_transcript and len(full_transcript) > len(recent_transcript):
+        full_context_section = f"""FULL CONVERSATION SO FAR (for context - remember everything):
+\"\"\"{full_transcript}\"\"\"
+
+"""
+
+    user_message = f"""{full_context_section}WHAT THEY JUST SAID:
+\"\"\"{recent_transcript}\"\"\"
+
+{context}{prev_q_context}
+
+IMPORTANT: Ask about something NEW they mentioned. Don't repeat topics from previous questions. Be creative and varied!"""
+
+    return user_message, prompt_type
+
 
 class PromptGenerator:
     """Generates contextual prompts using OpenAI's API."""
 
-    def __init__(self):
+    def __init__(self, on_rate_limited: Optional[Callable[[Optional[float]], None]] = None):
+        # Concurrency and rate limiting are handled by LLMScheduler, which
+        # is told about 429s through on_rate_limited(retry_after_seconds)
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
-        self._lock = asyncio.Lock()
+        self.on_rate_limited = on_rate_limited
         self._previous_questions: list[str] = []  # Track previous questions to avoid repetition
 
+    def estimate_tokens(self, user_message: str) -> int:
+        """Rough upper bound on tokens a request_prompt call will use (~4 chars/token)."""
+        return (len(SYSTEM_PROMPT) + len(user_message)) // 4 + MAX_RESPONSE_TOKENS
+
     async def generate_prompt(
         self,
         transcript: str,
@@ -70,72 +133,80 @@ class PromptGenerator:
         Returns:
             A dict with 'text' and 'type' keys, or None if generation fails
         """
-        async with self._lock:
-            try:
-                # Focus on the LAST part of transcript (most recent speech)
-                # Split by sentences and take the last few
-                sentences = transcript.replace('?', '?.').replace('!', '!.').replace('.', '.|').split('|')
-                sentences = [s.strip() for s in sentences if s.strip()]
-
-                # Take last 3-4 sentences as the focus
-                recent_sentences = sentences[-4:] if len(sentences) > 4 else sentences
-                recent_transcript = ' '.join(recent_sentences)
-
-                # Build context about previous questions - STRONGLY enforce no repetition
-                prev_q_context = ""
-                if self._previous_questions:
-                    prev_q_context = f"\n\nQUESTIONS ALREADY ASKED (DO NOT ask similar ones - pick a DIFFERENT topic!):\n" + "\n".join(f"- {q}" for q in self._previous_questions[-5:])
-
-                if is_closing:
-                    context = "Session ending soon. Ask a good closing/reflective question."
-                    prompt_type = "closing"
-                elif duration_seconds < 30:
-                    context = "Just started. Ask about something interesting they mentioned."
-                    prompt_type = "opener"
-                else:
-                    context = "Mid-conversation. Ask a follow-up about their MOST RECENT point. You can make connections to earlier topics."
-                    prompt_type = "follow_up"
-
-                # Build the full context section
-                full_context_section = ""
-                if full_transcript and len(full_transcript) > len(recent_transcript):
-                    full_context_section = f"""FULL CONVERSATION SO FAR (for context - remember everything):
-\"\"\"{full_transcript}\"\"\"
-
-"""
+        user_message, prompt_type = self.build_request(
+            transcript, duration_seconds, is_closing, full_transcript
+        )
+        return await self.request_prompt(user_message, prompt_type)
 
-                user_message = f"""{full_context_section}WHAT THEY JUST SAID:
-\"\"\"{recent_transcript}\"\"\"
+    def build_request(
+        self,
+        transcript: str,
+        duration_seconds: int,
+        is_closing: bool = False,
+        full_transcript: str = "",
+    ) -> tuple[str, str]:
+        """
+        Build the user message for a prompt request (pure CPU work).
 
-{context}{prev_q_context}
+        Returns:
+            A (user_message, prompt_type) tuple
+        """
+        return build_user_message(
+            transcript, duration_seconds, is_closing, full_transcript, list(self._previous_questions)
+        )
 
-IMPORTANT: Ask about something NEW they mentioned. Don't repeat topics from previous questions. Be creative and varied!"""
+    async def request_prompt(self, user_message: str, prompt_type: str) -> Optional[dict]:
+        """
+        Ask the LLM for a prompt using a message from build_request.
 
-                response = await self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_message},
-                    ],
-                    max_tokens=80,
-                    temperature=0.9,  # Higher temperature for more variety
-                )
-
-                prompt_text = response.choices[0].message.content.strip()
-
-                # Clean up the prompt text
-                prompt_text = prompt_text.strip('"\'')
-
-                # Store this question to avoid repetition
-                self._previous_questions.append(prompt_text)
-                if len(self._previous_questions) > 10:
-                    self._previous_questions.pop(0)
-
-                return {
-                    "text": prompt_text,
-                    "type": prompt_type,
-                }
-
-            except Exception as e:
-                print(f"Failed to generate prompt: {e}")
-                return None
+        Returns:
+            A dict with 'text' and 'type' keys, or None if generation fails
+        """
+        try:
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message},
+                ],
+                max_tokens=MAX_RESPONSE_TOKENS,
+                temperature=0.9,  # Higher temperature for more variety
+            )
+
+            prompt_text = response.choices[0].message.content.strip()
+
+            # Clean up the prompt text
+            prompt_text = prompt_text.strip('"\'')
+
+            # Store this question to avoid repetition
+            self._previous_questions.append(prompt_text)
+            if len(self._previous_questions) > 10:
+                self._previous_questions.pop(0)
+
+            return {
+                "text": prompt_text,
+                "type": prompt_type,
+            }
+
+        except RateLimitError as e:
+            print(f"Rate limited while generating prompt: {e}")
+            if self.on_rate_limited:
+                self.on_rate_limited(_retry_after(e))
+            return None
+
+        except Exception as e:
+            print(f"Failed to generate prompt: {e}")
+            return None
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    """Seconds to wait according to a 429 response's headers, if given."""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
@@ -1,17 +1,31 @@
 import asyncio
 import json
+import time
 import uuid
 import traceback
 import sys
 from fastapi import WebSocket, WebSocketDisconnect
 from app.config import get_settings
+from app.services.audio_transcoder import AudioFormat, AudioTranscoder, transcode
+from app.services.compute_pool import ComputePool
 from app.services.deepgram_service import DeepgramService
+from app.services.llm_scheduler import LLMScheduler, Priority
 from app.services.prompt_generator import PromptGenerator
-from app.websocket.session import Session, SessionManager
+from app.websocket.session import Session, SessionManager, assemble_context
 
 settings = get_settings()
 session_manager = SessionManager()
-prompt_generator = PromptGenerator()
+llm_scheduler = LLMScheduler(
+    requests_per_minute=settings.openai_rpm_limit,
+    tokens_per_minute=settings.openai_tpm_limit,
+    max_concurrency=settings.llm_max_concurrency,
+    max_queue_wait=settings.llm_max_queue_wait,
+)
+prompt_generator = PromptGenerator(on_rate_limited=llm_scheduler.penalize)
+compute_pool = ComputePool(
+    max_workers=settings.compute_workers,
+    enabled=settings.offload_compute,
+)
 
 
 def log(msg):
@@ -26,6 +40,8 @@ class WebSocketHandler:
         self.websocket = websocket
         self.session: Session | None = None
         self.deepgram: DeepgramService | None = None
+        # Clients that never announce a format are assumed to send upstream audio
+        self.transcoder = AudioTranscoder(AudioFormat())
         self._prompt_task: asyncio.Task | None = None
         self._display_task: asyncio.Task | None = None
         self._running = False
@@ -84,11 +100,23 @@ class WebSocketHandler:
             audio_count = 0
             while self._running:
                 try:
-                    data = await asyncio.wait_for(
-                        self.websocket.receive_bytes(),
+                    message = await asyncio.wait_for(
+                        self.websocket.receive(),
                         timeout=1.0
                     )
 
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+
+                    # Text frames are control messages (e.g. audio format)
+                    if message.get("text") is not None:
+                        await self._handle_control_message(message["text"])
+                        continue
+
+                    data = message.get("bytes")
+                    if not data:
+                        continue
+
                     audio_count += 1
                     if audio_count % 20 == 1:
                         log(f">>> Audio chunk #{audio_count}: {len(data)} bytes")
@@ -97,7 +125,14 @@ class WebSocketHandler:
                         await self._send_message("error", "Session expired")
                         break
 
-                    await self.deepgram.send_audio(data)
+                    # Transcoding is the heaviest per-session compute; it runs
+                    # on a worker process, in order per session
+                    if not self.transcoder.is_passthrough:
+                        self.transcoder, data = await compute_pool.run(
+                            self.session.session_id, transcode, self.transcoder, data
+                        )
+                    if data:
+                        await self.deepgram.send_audio(data)
 
                 except asyncio.TimeoutError:
                     if self.session.is_expired:
@@ -117,6 +152,24 @@ class WebSocketHandler:
         finally:
             await self._cleanup()
 
+    async def _handle_control_message(self, text: str):
+        """Handle a JSON control message sent by the client."""
+        try:
+            message = json.loads(text)
+        except json.JSONDecodeError:
+            log(f">>> Ignoring malformed control message")
+            return
+
+        if message.get("type") == "audio_format":
+            try:
+                audio_format = AudioFormat.from_message(message.get("data"))
+            except ValueError as e:
+                await self._send_message("error", str(e))
+                return
+
+            self.transcoder = AudioTranscoder(audio_format)
+            log(f">>> Audio format: {audio_format.encoding} {audio_format.sample_rate}Hz x{audio_format.channels}")
+
     async def _handle_transcript(self, text: str, is_final: bool):
         """Handle incoming transcript from Deepgram."""
         if not self.session:
@@ -152,30 +205,52 @@ class WebSocketHandler:
                     log(f">>> [PREP] Already have pending prompt, waiting...")
                     continue
 
-                # Get recent transcript (for focus)
-                transcript = self.session.get_recent_transcript(
-                    settings.context_window_duration
+                # Get recent transcript (for focus) and full transcript (for
+                # context awareness)
+                transcript, full_transcript = assemble_context(
+                    self.session.transcript_segments,
+                    settings.context_window_duration,
+                    time.time(),
                 )
 
                 if len(transcript.strip()) < 15:
                     log(f">>> [PREP] Transcript too short ({len(transcript.strip())} chars)")
                     continue
 
-                # Get full transcript (for context awareness)
-                full_transcript = self.session.get_full_transcript()
+                # Nothing new said since the last generation? Skip the paid
+                # call - unless the session still needs its closing question
+                if (
+                    not self.session.needs_closing_prompt
+                    and not self.session.has_new_content(settings.prompt_min_new_words)
+                ):
+                    self.session.record_generation_avoided()
+                    log(f">>> [PREP] No new content since last prompt, skipping")
+                    continue
+
+                # Snapshot what this generation is based on
+                word_count = self.session.content_word_count
 
                 log(f">>> [PREP] Generating prompt (full context: {len(full_transcript)} chars)")
 
-                # Generate prompt in background with full context
+                # Generate prompt in background with full context, once the
+                # scheduler lets us through the shared OpenAI rate limits
                 is_closing = self.session.time_remaining < 60
-                result = await prompt_generator.generate_prompt(
-                    transcript=transcript,
-                    duration_seconds=self.session.duration,
-                    is_closing=is_closing,
-                    full_transcript=full_transcript,
+                user_message, prompt_type = prompt_generator.build_request(
+                    transcript,
+                    self.session.duration,
+                    is_closing,
+                    full_transcript,
+                )
+                result = await llm_scheduler.submit(
+                    lambda: self._request_prompt(user_message, prompt_type),
+                    get_priority=self._prompt_priority,
+                    is_useful=self._prompt_still_useful,
+                    estimated_tokens=prompt_generator.estimate_tokens(user_message),
                 )
 
                 if result:
+                    self.session.record_generation(word_count, result["type"])
+
                     # Store it, ready to display at the right moment
                     self.session.set_pending_prompt({
                         "id": str(uuid.uuid4()),
@@ -192,6 +267,30 @@ class WebSocketHandler:
             except Exception as e:
                 log(f">>> [PREP] Error: {e}")
 
+    async def _request_prompt(self, user_message: str, prompt_type: str):
+        """Dispatched by the scheduler - every call here is a paid request."""
+        self.session.record_llm_call()
+        return await prompt_generator.request_prompt(user_message, prompt_type)
+
+    def _prompt_priority(self) -> Priority:
+        """Scheduler priority for this session's next prompt (checked at dispatch)."""
+        if self.session.is_micro_pause() and not self.session.pending_prompt:
+            return Priority.PAUSE
+        if self.session.time_remaining < 60:
+            return Priority.CLOSING
+        if self.session.last_prompt_time == 0:
+            return Priority.OPENER
+        return Priority.FOLLOW_UP
+
+    def _prompt_still_useful(self) -> bool:
+        """Whether a queued prompt request for this session is still worth sending."""
+        return (
+            self._running
+            and not self.session.is_expired
+            and not self.session.is_paused
+            and not self.session.pending_prompt
+        )
+
     async def _prompt_display_loop(self):
         """
         Background task to DISPLAY prepared prompts at natural moments.
@@ -256,5 +355,7 @@ class WebSocketHandler:
             await self.deepgram.close()
 
         if self.session:
+            log(f">>> LLM calls: {self.session.llm_calls} made, {self.session.llm_calls_avoided} avoided")
+            compute_pool.release(self.session.session_id)
             session_manager.remove_session(self.session.session_id)
         log(">>> Cleanup complete")
@@ -1,3 +1,4 @@
+import re
 import time
 import uuid
 from typing import Optional, List
@@ -5,6 +6,19 @@ from dataclasses import dataclass, field
 from collections import deque
 
 
+# Filler words don't count as new content when deciding to regenerate
+FILLER_WORDS = {"um", "umm", "uh", "uhh", "uhm", "hmm", "mm", "mhm", "er", "erm", "ah"}
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Seconds between background prompt preparations
+PREPARE_INTERVAL = 12
+
+
+def content_words(text: str) -> list[str]:
+    """Normalized words of a transcript, without punctuation or fillers."""
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in FILLER_WORDS]
+
+
 @dataclass
 class TranscriptSegment:
     text: str
@@ -12,6 +26,19 @@ class TranscriptSegment:
     is_final: bool
 
 
+def assemble_context(segments: List[TranscriptSegment], seconds: int, now: float) -> tuple[str, str]:
+    """
+    Build (recent transcript, full final transcript) from a snapshot of
+    segments. Pure function so it can run on a compute worker.
+    """
+    # Recent includes the current interim for faster context; full only
+    # includes final segments to avoid duplicates from interim updates
+    cutoff_time = now - seconds
+    recent = " ".join(seg.text for seg in segments if seg.timestamp >= cutoff_time)
+    full = " ".join(seg.text for seg in segments if seg.is_final)
+    return recent, full
+
+
 @dataclass
 class Session:
     """Represents a recording session."""
@@ -30,6 +57,14 @@ class Session:
     word_timestamps: deque = field(default_factory=lambda: deque(maxlen=50))  # Recent word timings
     pending_prompt: dict = field(default_factory=dict)  # Pre-generated prompt ready to show
 
+    # Content tracking so unchanged transcripts don't trigger new LLM calls
+    content_word_count: int = 0  # Non-filler words across all final segments
+    generated_word_count: int = 0  # content_word_count at the last generation
+    closing_generated: bool = False
+    llm_calls: int = 0  # Requests actually dispatched to the LLM, even failed ones
+    llm_calls_avoided: int = 0
+    last_avoided_time: float = 0
+
     @property
     def duration(self) -> int:
         return int(time.time() - self.start_time)
@@ -63,6 +98,8 @@ class Session:
             self.word_timestamps.append(now)
             self.current_utterance = ""
             self.transcript_segments.append(segment)
+            words = content_words(text)
+            self.content_word_count += len(words)
         else:
             # Still update if it's significantly new content (not just small updates)
             if len(text) > len(self.current_utterance) + 5:
@@ -74,24 +111,6 @@ class Session:
             else:
                 self.transcript_segments.append(segment)
 
-    def get_recent_transcript(self, seconds: int = 60) -> str:
-        """Get transcript including current interim for faster context."""
-        cutoff_time = time.time() - seconds
-        recent = [
-            seg.text for seg in self.transcript_segments
-            if seg.timestamp >= cutoff_time
-        ]
-        return " ".join(recent)
-
-    def get_full_transcript(self) -> str:
-        """Get the complete transcript from the entire session."""
-        # Only include final segments to avoid duplicates from interim updates
-        final_segments = [
-            seg.text for seg in self.transcript_segments
-            if seg.is_final
-        ]
-        return " ".join(final_segments)
-
     def get_speech_rate(self) -> float:
         """Calculate recent speech rate (words per second) to detect pauses."""
         if len(self.word_timestamps) < 2:
@@ -137,7 +156,7 @@ class Session:
         if self.last_prompt_time == 0:
             return self.duration >= 8
 
-        return (time.time() - self.last_prompt_time) >= 12
+        return (time.time() - self.last_prompt_time) >= PREPARE_INTERVAL
 
     def can_show_prompt(self) -> bool:
         """
@@ -161,6 +180,39 @@ class Session:
         # Show at micro-pause (natural breath point)
         return self.is_micro_pause()
 
+    @property
+    def needs_closing_prompt(self) -> bool:
+        """In the last minute with no closing prompt generated yet."""
+        return self.time_remaining < 60 and not self.closing_generated
+
+    def has_new_content(self, min_words: int) -> bool:
+        """
+        Has enough been said since the last generation to justify a new one?
+        Final transcripts only grow, so counting new non-filler words is enough
+        to tell whether the speaker said anything that could change the prompt.
+        """
+        return self.content_word_count - self.generated_word_count >= min_words
+
+    def record_llm_call(self):
+        """Count a request that was dispatched to the LLM."""
+        self.llm_calls += 1
+
+    def record_generation(self, word_count: int, prompt_type: str):
+        """Remember what the last successful generation was based on."""
+        self.generated_word_count = word_count
+        if prompt_type == "closing":
+            self.closing_generated = True
+
+    def record_generation_avoided(self):
+        """
+        Count a skipped LLM call. The loop re-checks every second, so count at
+        most one per prepare interval - the rate calls were made without skipping.
+        """
+        now = time.time()
+        if now - self.last_avoided_time >= PREPARE_INTERVAL:
+            self.last_avoided_time = now
+            self.llm_calls_avoided += 1
+
     def set_pending_prompt(self, prompt: dict):
         """Store a pre-generated prompt."""
         self.pending_prompt = prompt
@@ -181,6 +233,10 @@ class SessionManager:
 
     def __init__(self):
         self._sessions: dict[str, Session] = {}
+        # Totals from sessions that have already ended
+        self._ended_seconds = 0
+        self._ended_llm_calls = 0
+        self._ended_llm_calls_avoided = 0
 
     def create_session(self, max_duration: int = 900) -> Session:
         session = Session(max_duration=max_duration)
@@ -192,7 +248,7 @@ class SessionManager:
 
     def remove_session(self, session_id: str):
         if session_id in self._sessions:
-            del self._sessions[session_id]
+            self._record_ended(self._sessions.pop(session_id))
 
     def cleanup_expired(self):
         expired = [
@@ -200,4 +256,24 @@ class SessionManager:
             if session.is_expired
         ]
         for sid in expired:
-            del self._sessions[sid]
+            self._record_ended(self._sessions.pop(sid))
+
+    def get_stats(self) -> dict:
+        """LLM call statistics across ended and active sessions."""
+        sessions = self._sessions.values()
+        seconds = self._ended_seconds + sum(s.duration for s in sessions)
+        calls = self._ended_llm_calls + sum(s.llm_calls for s in sessions)
+        avoided = self._ended_llm_calls_avoided + sum(s.llm_calls_avoided for s in sessions)
+        hours = seconds / 3600
+        return {
+            "activeSessions": len(self._sessions),
+            "sessionHours": round(hours, 3),
+            "llmCalls": calls,
+            "llmCallsAvoided": avoided,
+            "llmCallsAvoidedPerSessionHour": round(avoided / hours, 1) if hours else 0.0,
+        }
+
+    def _record_ended(self, session: Session):
+        self._ended_seconds += min(session.duration, session.max_duration)
+        self._ended_llm_calls += session.llm_calls
+        self._ended_llm_calls_avoided += session.llm_calls_avoided
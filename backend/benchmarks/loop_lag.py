@@ -0,0 +1,100 @@
+"""
+Benchmark event-loop lag under simulated session load, inline vs offloaded.
+
+Each simulated session streams 48 kHz float32 audio through the transcoder
+and prepares a prompt (context assembly + request building) every second
+over a long transcript, like WebSocketHandler does. Only transcoding goes
+to the compute pool; prompt preparation stays on the loop in both modes.
+
+Run from the backend directory:
+    python -m benchmarks.loop_lag --sessions 50
+
+Use --chunk-frames to see the effect of larger client chunks.
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+from app.services.audio_transcoder import AudioFormat, AudioTranscoder, transcode
+from app.services.compute_pool import ComputePool
+from app.services.loop_monitor import LoopLagMonitor
+from app.services.prompt_generator import build_user_message
+from app.websocket.session import TranscriptSegment, assemble_context
+
+
+SOURCE_FORMAT = AudioFormat("float32", 48000, 1)
+PREVIOUS_QUESTIONS = ["What made you pick mangoes?", "How did the family react?"]
+
+
+def make_segments(count: int) -> list[TranscriptSegment]:
+    """A long final transcript, roughly a full 15 minute session."""
+    now = time.time()
+    sentence = "So I went to the market today and bought some fresh mangoes for the family."
+    return [
+        TranscriptSegment(text=sentence, timestamp=now - (count - i), is_final=True)
+        for i in range(count)
+    ]
+
+
+async def simulate_session(
+    session_id: int,
+    pool: ComputePool,
+    segments: list[TranscriptSegment],
+    duration: float,
+    chunk_frames: int,
+):
+    transcoder = AudioTranscoder(SOURCE_FORMAT)
+    chunk = np.random.default_rng(session_id).uniform(-0.5, 0.5, chunk_frames).astype("<f4").tobytes()
+    chunk_interval = chunk_frames / SOURCE_FORMAT.sample_rate
+
+    async def audio():
+        nonlocal transcoder
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            transcoder, _ = await pool.run(str(session_id), transcode, transcoder, chunk)
+            await asyncio.sleep(chunk_interval)
+
+    async def prompts():
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            transcript, full_transcript = assemble_context(segments, 60, time.time())
+            build_user_message(transcript, 300, False, full_transcript, PREVIOUS_QUESTIONS)
+            await asyncio.sleep(1)
+
+    await asyncio.gather(audio(), prompts())
+
+
+async def run(offload: bool, args: argparse.Namespace) -> dict:
+    pool = ComputePool(max_workers=args.workers, enabled=offload)
+    segments = make_segments(args.segments)
+    monitor = LoopLagMonitor(interval=0.01)
+    await pool.start()
+
+    monitor.start()
+    await asyncio.gather(*(
+        simulate_session(i, pool, segments, args.duration, args.chunk_frames)
+        for i in range(args.sessions)
+    ))
+    await monitor.stop()
+    pool.shutdown()
+    return monitor.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-loop lag, inline vs offloaded compute")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--segments", type=int, default=300, help="final transcript segments per session")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--chunk-frames", type=int, default=4096, help="audio frames per client chunk")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for offload in (False, True):
+        stats = asyncio.run(run(offload, args))
+        mode = "offload" if offload else "inline"
+        print(f"{mode:<10} {stats['p50Ms']:>8} {stats['p95Ms']:>8} {stats['p99Ms']:>8} {stats['maxMs']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark audio transcoding throughput on a single core.
+
+Run from the backend directory:
+    python -m benchmarks.transcode_throughput
+"""
+import argparse
+import time
+import numpy as np
+from app.services.audio_transcoder import AudioFormat, AudioTranscoder
+
+
+FORMATS = [
+    AudioFormat("float32", 48000, 1),
+    AudioFormat("float32", 48000, 2),
+    AudioFormat("float32", 44100, 1),
+    AudioFormat("int16", 44100, 2),
+    AudioFormat("float32", 16000, 1),
+]
+
+
+def make_chunks(audio_format: AudioFormat, seconds: float, chunk_frames: int) -> list[bytes]:
+    """Generate noisy test audio in the given format, split like client chunks."""
+    rng = np.random.default_rng(0)
+    frames = int(audio_format.sample_rate * seconds)
+    samples = rng.uniform(-0.5, 0.5, frames * audio_format.channels).astype(np.float32)
+    if audio_format.encoding == "int16":
+        samples = (samples * 32767).astype(np.int16)
+    data = samples.astype(audio_format.dtype).tobytes()
+
+    step = chunk_frames * audio_format.frame_size
+    return [data[i:i + step] for i in range(0, len(data), step)]
+
+
+def run(audio_format: AudioFormat, seconds: float, chunk_frames: int) -> tuple[float, float]:
+    """Return (audio seconds per wall second, input MB per second)."""
+    chunks = make_chunks(audio_format, seconds, chunk_frames)
+    transcoder = AudioTranscoder(audio_format)
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        transcoder.convert(chunk)
+    elapsed = time.perf_counter() - start
+
+    total_bytes = sum(len(c) for c in chunks)
+    return seconds / elapsed, total_bytes / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio per format")
+    parser.add_argument("--chunk-frames", type=int, default=4096, help="frames per client chunk")
+    args = parser.parse_args()
+
+    # "x realtime" is also the number of live streams one core can sustain
+    print(f"{'format':<24} {'x realtime':>12} {'MB/s in':>10}")
+    for audio_format in FORMATS:
+        realtime, mb_per_sec = run(audio_format, args.seconds, args.chunk_frames)
+        label = f"{audio_format.encoding} {audio_format.sample_rate}Hz x{audio_format.channels}"
+        print(f"{label:<24} {realtime:>12.0f} {mb_per_sec:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
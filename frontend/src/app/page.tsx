@@ -7,7 +7,7 @@ import { ExportModal } from '@/components/ExportModal';
 import { LimitReachedModal } from '@/components/LimitReachedModal';
 import { useMediaRecorder } from '@/hooks/useMediaRecorder';
 import { useWebSocket } from '@/hooks/useWebSocket';
-import { Prompt, TranscriptSegment } from '@/types';
+import { AudioFormat, Prompt, TranscriptSegment } from '@/types';
 
 const WS_URL = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000/ws';
 
@@ -19,6 +19,7 @@ export default function Home() {
   const [error, setError] = useState<string | null>(null);
 
   const sendAudioRef = useRef<((data: Blob) => void) | null>(null);
+  const sendAudioFormatRef = useRef<((format: AudioFormat) => void) | null>(null);
 
   const handlePrompt = useCallback((prompt: Prompt) => {
     console.log('Received prompt:', prompt);
@@ -43,6 +44,7 @@ export default function Home() {
     connect,
     disconnect,
     sendAudio,
+    sendAudioFormat,
   } = useWebSocket({
     url: WS_URL,
     onPrompt: handlePrompt,
@@ -51,6 +53,7 @@ export default function Home() {
   });
 
   sendAudioRef.current = sendAudio;
+  sendAudioFormatRef.current = sendAudioFormat;
 
   const handleRecordingComplete = useCallback((blob: Blob) => {
     disconnect();
@@ -63,6 +66,12 @@ export default function Home() {
     }
   }, []);
 
+  const handleAudioFormat = useCallback((format: AudioFormat) => {
+    if (sendAudioFormatRef.current) {
+      sendAudioFormatRef.current(format);
+    }
+  }, []);
+
   const {
     isRecording,
     isPaused,
@@ -77,6 +86,7 @@ export default function Home() {
     error: recorderError,
   } = useMediaRecorder({
     onAudioData: handleAudioData,
+    onAudioFormat: handleAudioFormat,
     onRecordingComplete: handleRecordingComplete,
   });
 
@@ -2,9 +2,11 @@
 
 import { useState, useRef, useCallback, useEffect } from 'react';
 import { MAX_RECORDING_DURATION } from '@/lib/constants';
+import { AudioFormat } from '@/types';
 
 interface UseMediaRecorderProps {
   onAudioData?: (data: Blob) => void;
+  onAudioFormat?: (format: AudioFormat) => void;
   onRecordingComplete?: (blob: Blob) => void;
 }
 
@@ -24,6 +26,7 @@ interface UseMediaRecorderReturn {
 
 export function useMediaRecorder({
   onAudioData,
+  onAudioFormat,
   onRecordingComplete,
 }: UseMediaRecorderProps = {}): UseMediaRecorderReturn {
   const [isRecording, setIsRecording] = useState(false);
@@ -98,7 +101,13 @@ export function useMediaRecorder({
 
       // Set up audio processing for real-time streaming
       if (onAudioData) {
-        audioContextRef.current = new AudioContext({ sampleRate: 16000 });
+        // Run at the device's native rate - the server resamples for us
+        audioContextRef.current = new AudioContext();
+        onAudioFormat?.({
+          encoding: 'float32',
+          sampleRate: audioContextRef.current.sampleRate,
+          channels: 1,
+        });
         const source = audioContextRef.current.createMediaStreamSource(stream);
 
         // Use ScriptProcessorNode for audio chunks (deprecated but widely supported)
@@ -106,16 +115,9 @@ export function useMediaRecorder({
 
         audioProcessorRef.current.onaudioprocess = (e) => {
           if (!isPaused) {
+            // Send raw float32 samples - conversion happens server-side
             const inputData = e.inputBuffer.getChannelData(0);
-            const pcmData = new Int16Array(inputData.length);
-
-            // Convert float32 to int16
-            for (let i = 0; i < inputData.length; i++) {
-              const s = Math.max(-1, Math.min(1, inputData[i]));
-              pcmData[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
-            }
-
-            const blob = new Blob([pcmData.buffer], { type: 'audio/pcm' });
+            const blob = new Blob([inputData.slice().buffer], { type: 'audio/pcm' });
             onAudioData(blob);
           }
         };
@@ -163,7 +165,7 @@ export function useMediaRecorder({
       }
       console.error('Recording error:', err);
     }
-  }, [onAudioData, onRecordingComplete, isPaused]);
+  }, [onAudioData, onAudioFormat, onRecordingComplete, isPaused]);
 
   const stopRecording = useCallback(() => {
     if (mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useRef, useCallback, useEffect } from 'react';
-import { Prompt, TranscriptSegment, WebSocketMessage, SessionInfo } from '@/types';
+import { AudioFormat, Prompt, TranscriptSegment, WebSocketMessage, SessionInfo } from '@/types';
 
 interface UseWebSocketProps {
   url: string;
@@ -16,6 +16,7 @@ interface UseWebSocketReturn {
   connect: () => Promise<void>;
   disconnect: () => void;
   sendAudio: (data: Blob) => void;
+  sendAudioFormat: (format: AudioFormat) => void;
   sessionInfo: SessionInfo | null;
 }
 
@@ -127,6 +128,13 @@ export function useWebSocket({
     }
   }, []);
 
+  // Announce the raw audio format so the server can convert it for Deepgram
+  const sendAudioFormat = useCallback((format: AudioFormat) => {
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      wsRef.current.send(JSON.stringify({ type: 'audio_format', data: format }));
+    }
+  }, []);
+
   // Cleanup on unmount
   useEffect(() => {
     return () => {
@@ -139,6 +147,7 @@ export function useWebSocket({
     connect,
     disconnect,
     sendAudio,
+    sendAudioFormat,
     sessionInfo,
   };
 }
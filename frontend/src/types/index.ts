@@ -28,3 +28,9 @@ export interface SessionInfo {
   maxDuration: number;
   timeRemaining: number;
 }
+
+export interface AudioFormat {
+  encoding: 'float32' | 'int16';
+  sampleRate: number;
+  channels: number;
+}